@@ -4,13 +4,13 @@
 使用 Picamera2 库捕获视频并通过 Flask 提供 MJPEG 流
 """
 
-from flask import Flask, Response, render_template_string
+from flask import Flask, Response, render_template_string, request
 from picamera2 import Picamera2
 from picamera2.encoders import JpegEncoder
 from picamera2.outputs import FileOutput
 import io
+import gzip
 import threading
-import time
 
 app = Flask(__name__)
 
@@ -36,41 +36,46 @@ class StreamingOutput(io.BufferedIOBase):
 def initialize_camera():
     """初始化相机"""
     global picam2, streaming_output
-    
+
     picam2 = Picamera2()
-    
+
     # 配置相机 - 使用较低分辨率以获得更好的流畅度
     config = picam2.create_video_configuration(
         main={"size": (640, 480), "format": "RGB888"}
     )
     picam2.configure(config)
-    
+
     # 创建流输出
     streaming_output = StreamingOutput()
-    
-    # 启动相机
-    picam2.start()
+
+    # 启动相机并持续录制到流输出
+    # 使用硬件辅助的JPEG编码器，每帧只编码一次，所有客户端共享
+    encoder = JpegEncoder(q=80)
+    picam2.start_recording(encoder, FileOutput(streaming_output))
     print("相机初始化成功")
 
 
+# multipart边界常量：头/帧/尾分别yield，避免每帧拼接JPEG大小的新bytes
+_BOUNDARY_HEAD = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+_BOUNDARY_TAIL = b'\r\n'
+
+
 def generate_frames():
     """生成MJPEG流的帧"""
-    global picam2
-    
+    global streaming_output
+
     try:
         while True:
-            # 捕获JPEG格式的图像
-            buffer = io.BytesIO()
-            picam2.capture_file(buffer, format='jpeg')
-            frame = buffer.getvalue()
-            
+            # 等待编码器产出新的一帧（帧率由相机/编码器决定，无需sleep）
+            with streaming_output.condition:
+                streaming_output.condition.wait()
+                frame = streaming_output.frame
+
             # 生成MJPEG流格式
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-            
-            # 控制帧率 (约30fps)
-            time.sleep(0.033)
-            
+            yield _BOUNDARY_HEAD
+            yield frame
+            yield _BOUNDARY_TAIL
+
     except Exception as e:
         print(f"生成帧时出错: {e}")
 
@@ -191,10 +196,24 @@ HTML_TEMPLATE = """
 """
 
 
+# 首页渲染结果缓存：模板内容是静态的（url_for('video_feed')恒为/video_feed），
+# 只在第一次请求时渲染并同时预压缩gzip，之后直接返回缓存的字节
+_index_html = None
+_index_gzip = None
+
+
 @app.route('/')
 def index():
     """主页面"""
-    return render_template_string(HTML_TEMPLATE)
+    global _index_html, _index_gzip
+    if _index_html is None:
+        _index_html = render_template_string(HTML_TEMPLATE).encode('utf-8')
+        _index_gzip = gzip.compress(_index_html, 9)
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        return Response(_index_gzip, mimetype='text/html',
+                        headers={'Content-Encoding': 'gzip',
+                                 'Vary': 'Accept-Encoding'})
+    return Response(_index_html, mimetype='text/html')
 
 
 @app.route('/video_feed')
@@ -220,7 +239,7 @@ def cleanup():
     """清理资源"""
     global picam2
     if picam2:
-        picam2.stop()
+        picam2.stop_recording()
         picam2.close()
         print("相机资源已释放")
 
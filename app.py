@@ -7,14 +7,16 @@
 
 from dataclasses import dataclass
 
+import os
 import cv2
+import gzip
 import time
-import hashlib  
+import hashlib
 import threading
+import multiprocessing
 import numpy as np
 from functools import wraps  
 from flask_cors import CORS  # 处理跨域问题
-from datetime import datetime
 from flask import Flask, Response, jsonify, send_from_directory, request  #  添加 request
 
 # 尝试导入picamera2，如果失败则使用cv2作为备用
@@ -25,12 +27,52 @@ except ImportError:
     print("警告: picamera2未安装，将使用OpenCV作为备用方案")
     USE_PICAMERA2 = False
 
+# 尝试导入psutil（模块级导入一次，避免每次状态请求都走import/ImportError路径）
+try:
+    import psutil
+    _HAS_PSUTIL = True
+    psutil.cpu_percent(interval=None)  # 预热：建立首次采样基准
+except ImportError:
+    _HAS_PSUTIL = False
+
+# 尝试导入libjpeg-turbo绑定（NEON/SIMD加速，编码比OpenCV自带路径快2-3倍）
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _turbo_jpeg = TurboJPEG()
+    USE_TURBOJPEG = True
+except Exception:
+    print("警告: PyTurboJPEG不可用，将使用OpenCV编码JPEG")
+    USE_TURBOJPEG = False
+
 app = Flask(__name__, static_folder='static')
 CORS(app)  # 启用跨域资源共享
+
+# 尝试用orjson（Rust实现+SIMD，比标准库json快3-10倍）接管jsonify的序列化
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class OrJSONProvider(JSONProvider):
+        """基于orjson的Flask JSON提供者，所有jsonify响应自动受益"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrJSONProvider(app)
+    _HAS_ORJSON = True
+except ImportError:
+    print("警告: orjson未安装，将使用标准库json序列化")
+    _HAS_ORJSON = False
 # ==================== 全局变量 ====================
 current_frame = None
 frame_lock = threading.Lock()
-robot_position = {"x": 50, "y": 50}  # 机器人位置（百分比）
+# 机器人位置（百分比）[x, y]——共享内存整型数组而不是dict：
+# 读侧是视频流每帧的热路径，下标访问是C级加载；
+# gunicorn多进程部署时各worker读到的也是同一份数据
+robot_position = multiprocessing.Array('i', [50, 50])
 camera = None
 
 # 鉴权配置（硬编码密钥的SHA1）
@@ -91,8 +133,20 @@ class CameraManager:
     def __init__(self):
         self.camera = None
         self.running = False
-        self.frame = None
+        # 双缓冲：采集线程写入后备缓冲，写满后原子切换索引
+        # 消费端直接按引用读取活动缓冲，省掉每帧约900KB的copy
+        self._buffers = [
+            np.empty((480, 640, 3), dtype=np.uint8),
+            np.empty((480, 640, 3), dtype=np.uint8),
+        ]
+        self._active = 0
+        self._has_frame = False
+        # MJPG直通模式：USB相机直接输出压缩JPEG，跳过解码+再编码
+        self.raw_mjpeg = False
+        self.jpeg_frame = None
         self.lock = threading.Lock()
+        # 新帧到达时通知所有流客户端，代替固定sleep的节拍
+        self.condition = threading.Condition(self.lock)
         
     def start(self):
         """启动摄像头"""
@@ -104,8 +158,9 @@ class CameraManager:
                 self.camera = Picamera2()
                 
                 # 配置相机 - 针对USB相机优化
+                # 直接请求BGR888，省掉每帧的RGB->BGR转换
                 config = self.camera.create_video_configuration(
-                    main={"size": (640, 480), "format": "RGB888"}
+                    main={"size": (640, 480), "format": "BGR888"}
                 )
                 self.camera.configure(config)
                 self.camera.start()
@@ -113,8 +168,9 @@ class CameraManager:
                 print("✓ Picamera2 USB相机启动成功")
                 self.running = True
                 
-                # 启动帧捕获线程
+                # 启动帧捕获线程和温度自适应监控线程
                 threading.Thread(target=self._capture_picamera2, daemon=True).start()
+                threading.Thread(target=_thermal_monitor, daemon=True).start()
                 return True
                 
             except Exception as e:
@@ -132,9 +188,20 @@ class CameraManager:
                 self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                 self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 self.camera.set(cv2.CAP_PROP_FPS, 15)
-                
+
                 if not self.camera.isOpened():
                     raise Exception("无法打开摄像头")
+
+                # 优先请求相机端MJPG压缩流：省掉YUYV->BGR转换和服务端JPEG编码
+                self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+                ret, probe = self.camera.read()
+                if ret and probe is not None and probe.ravel()[:2].tobytes() == b'\xff\xd8':
+                    self.raw_mjpeg = True
+                    print("✓ 相机支持MJPG，启用JPEG直通模式")
+                else:
+                    # 相机不支持MJPG直通，回退到BGR解码模式
+                    self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
                 
                 print("✓ OpenCV USB相机启动成功")
                 self.running = True
@@ -151,17 +218,11 @@ class CameraManager:
         """Picamera2帧捕获线程"""
         while self.running:
             try:
-                # 捕获帧
+                # 捕获帧（已是BGR格式；capture_array阻塞到下一帧，由驱动定节拍）
                 frame = self.camera.capture_array()
-                
-                # 转换为BGR格式（OpenCV格式）
-                frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                
+
                 # 更新帧
-                with self.lock:
-                    self.frame = frame_bgr
-                
-                time.sleep(1/24)  # 24 FPS
+                self._publish_frame(frame)
                 
             except Exception as e:
                 print(f"帧捕获错误: {e}")
@@ -171,24 +232,81 @@ class CameraManager:
         """OpenCV帧捕获线程"""
         while self.running:
             try:
-                ret, frame = self.camera.read()
-                if ret:
-                    with self.lock:
-                        self.frame = frame
+                if self.raw_mjpeg:
+                    # 直通模式：read()返回相机压缩好的JPEG码流
+                    ret, data = self.camera.read()
+                    if ret:
+                        with self.condition:
+                            self.jpeg_frame = data.tobytes()
+                            self.condition.notify_all()
+                        continue
                 else:
-                    print("读取帧失败")
-                    time.sleep(0.1)
+                    # grab+retrieve直接解码进后备缓冲，避免read()每帧新建数组
+                    ret = self.camera.grab()
+                    if ret:
+                        back = 1 - self._active
+                        ret, self._buffers[back] = self.camera.retrieve(self._buffers[back])
+                    if ret:
+                        # 发布前叠加信息层（此时只有采集线程持有后备缓冲）
+                        _apply_overlay(self._buffers[back])
+                        with self.condition:
+                            self._active = back
+                            self._has_frame = True
+                            self.condition.notify_all()
+                        continue
+                # 成功路径都已continue，走到这里说明读取失败
+                print("读取帧失败")
+                time.sleep(0.1)
                     
             except Exception as e:
                 print(f"帧捕获错误: {e}")
                 time.sleep(0.1)
     
+    def _publish_frame(self, frame):
+        """将新帧写入后备缓冲、叠加信息层并原子切换索引"""
+        back = 1 - self._active
+        if frame.shape == self._buffers[back].shape:
+            np.copyto(self._buffers[back], frame)
+        else:
+            self._buffers[back] = frame
+        # 发布前由采集线程（唯一写者）叠加时间戳/位置信息
+        _apply_overlay(self._buffers[back])
+        with self.condition:
+            self._active = back
+            self._has_frame = True
+            self.condition.notify_all()
+
     def get_frame(self):
-        """获取当前帧"""
+        """获取当前帧（按引用返回活动缓冲，调用方不得修改）"""
         with self.lock:
-            if self.frame is not None:
-                return self.frame.copy()
+            if self._has_frame:
+                return self._buffers[self._active]
             return None
+
+    def get_jpeg(self):
+        """获取相机直出的JPEG帧（仅MJPG直通模式下有值）"""
+        with self.lock:
+            return self.jpeg_frame
+
+    def wait_for_frame(self, timeout=1.0):
+        """阻塞等待下一帧到达；超时返回，便于无相机时生成占位图"""
+        with self.condition:
+            self.condition.wait(timeout)
+
+    def reconfigure(self, size):
+        """运行中切换采集分辨率（仅picamera2路径，由ISP完成缩放）"""
+        if not (self.running and USE_PICAMERA2 and self.camera is not None):
+            return
+        try:
+            self.camera.stop()
+            config = self.camera.create_video_configuration(
+                main={"size": size, "format": "BGR888"}
+            )
+            self.camera.configure(config)
+            self.camera.start()
+            print(f"✓ 相机分辨率已切换为 {size[0]}x{size[1]}")
+        except Exception as e:
+            print(f"✗ 相机重配置失败: {e}")
     
     def stop(self):
         """停止摄像头"""
@@ -206,46 +324,240 @@ class CameraManager:
         
         print("摄像头已停止")
 
+# 温度自适应分辨率：树莓派过热降频时JPEG编码跟不上，
+# 超温就降到320x240（ISP缩放，编码量减少4倍），前端CSS继续按容器显示，
+# 画质平滑下降而不是丢帧；带滞回区间避免在阈值附近来回切换
+_THERMAL_HIGH = 70.0       # 超过该温度(℃)降分辨率
+_THERMAL_LOW = 65.0        # 低于该温度恢复全分辨率
+_FULL_SIZE = (640, 480)
+_REDUCED_SIZE = (320, 240)
+
+
+def _thermal_monitor():
+    """后台线程：每5秒采样CPU温度，按需切换采集分辨率"""
+    reduced = False
+    while camera_manager.running:
+        temp = get_cpu_temperature()
+        if not reduced and temp > _THERMAL_HIGH:
+            camera_manager.reconfigure(_REDUCED_SIZE)
+            reduced = True
+        elif reduced and temp < _THERMAL_LOW:
+            camera_manager.reconfigure(_FULL_SIZE)
+            reduced = False
+        time.sleep(5)
+
+
 # 初始化摄像头管理器
 camera_manager = CameraManager()
 
+# gunicorn部署时没有__main__入口，由首个请求惰性启动摄像头；
+# python app.py / main.py 先行调用start()后此钩子不会重复启动
+_camera_start_lock = threading.Lock()
+_camera_start_attempted = False
+
+
+@app.before_request
+def _ensure_camera_started():
+    global _camera_start_attempted
+    if not _camera_start_attempted and not camera_manager.running:
+        with _camera_start_lock:
+            if not _camera_start_attempted and not camera_manager.running:
+                _camera_start_attempted = True
+                camera_manager.start()
+
 # ==================== 视频流生成 ====================
+
+# multipart边界常量：头/帧/尾三段分别yield，让WSGI层按writev语义聚合，
+# 省掉每帧拼接出一个JPEG大小的新bytes对象（15FPS下约0.5-1MB/s的分配）
+_BOUNDARY_HEAD = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+_BOUNDARY_TAIL = b'\r\n'
+
+# OpenCV回退路径的JPEG编码参数（构造一次复用）：
+# 关闭渐进式扫描和二次Huffman优化，避免多遍编码；
+# 色度质量低于明度，近似4:2:0子采样的体积/速度收益
+_JPG_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, 80,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    cv2.IMWRITE_JPEG_CHROMA_QUALITY, 75,
+    cv2.IMWRITE_JPEG_LUMA_QUALITY, 85,
+]
+
+# 时间戳字符串缓存：值每秒才变化，strftime和datetime对象分配
+# 没必要每帧付一次，整秒变化时才重新格式化
+_ts_cache = {"sec": 0, "str": ""}
+
+
+def _get_timestamp():
+    """获取当前时间戳字符串（1Hz缓存）"""
+    sec = int(time.time())
+    if sec != _ts_cache["sec"]:
+        _ts_cache["sec"] = sec
+        _ts_cache["str"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    return _ts_cache["str"]
+
+
+# 叠加层缓存：时间戳每秒最多变一次、机器人位置只在控制指令时变化，
+# 没必要每帧都付putText的光栅化开销，内容不变时直接复用渲染结果
+_overlay_cache = {"key": None, "mask": None}
+
+
+def _get_overlay_mask(timestamp):
+    """获取叠加层蒙版，仅在时间戳或机器人位置变化时重新渲染"""
+    key = (timestamp, robot_position[0], robot_position[1])
+    if key != _overlay_cache["key"]:
+        mask = np.zeros((70, 400, 3), dtype=np.uint8)
+        cv2.putText(mask, timestamp, (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        cv2.putText(mask, f"Robot: ({key[1]}, {key[2]})", (10, 60),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        _overlay_cache["key"] = key
+        _overlay_cache["mask"] = mask
+    return _overlay_cache["mask"]
+
+
+def _apply_overlay(frame):
+    """把时间戳/位置叠加层混合到帧的左上角
+
+    只能由帧的唯一写者调用（采集线程发布前，或占位图的局部缓冲），
+    消费端拿到的活动缓冲已带叠加层，不再各自改写共享内存。
+    蒙版按帧尺寸裁剪，低分辨率档位下也不会尺寸不匹配。
+    """
+    mask = _get_overlay_mask(_get_timestamp())
+    h = min(mask.shape[0], frame.shape[0])
+    w = min(mask.shape[1], frame.shape[1])
+    frame[:h, :w] = cv2.add(frame[:h, :w], mask[:h, :w])
+
+
 def generate_frames():
     """生成视频流帧"""
     while True:
+        # 等待采集线程发布新帧（节拍由相机驱动决定，不再固定sleep）
+        camera_manager.wait_for_frame()
+
+        # MJPG直通：相机已输出压缩帧，跳过解码/叠加/再编码直接下发
+        jpeg = camera_manager.get_jpeg()
+        if jpeg is not None:
+            yield _BOUNDARY_HEAD
+            yield jpeg
+            yield _BOUNDARY_TAIL
+            continue
+
         frame = camera_manager.get_frame()
         
         if frame is None:
-            # 如果没有帧，生成黑色占位图
+            # 如果没有帧，生成黑色占位图（局部缓冲，叠加层在这里补画；
+            # 相机帧的叠加层已由采集线程在发布前画好）
             frame = np.zeros((480, 640, 3), dtype=np.uint8)
             cv2.putText(frame, "Camera Not Available", (150, 240),
                        cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        
-        # 添加时间戳叠加层（可选）
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cv2.putText(frame, timestamp, (10, 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-         
-        
-        # 编码为JPEG
-        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 100])
-        
-        if not ret:
-            continue
-        
-        frame_bytes = buffer.tobytes()
+            _apply_overlay(frame)
+
+        # 编码为JPEG（优先使用libjpeg-turbo，直接接受BGR输入）
+        if USE_TURBOJPEG:
+            frame_bytes = _turbo_jpeg.encode(frame, quality=80,
+                                             pixel_format=TJPF_BGR,
+                                             jpeg_subsample=TJSAMP_420)
+        else:
+            ret, buffer = cv2.imencode('.jpg', frame, _JPG_PARAMS)
+            if not ret:
+                continue
+            frame_bytes = buffer.tobytes()
         
         # 生成multipart响应
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        
-        time.sleep(1/15)  # 15 FPS
+        yield _BOUNDARY_HEAD
+        yield frame_bytes
+        yield _BOUNDARY_TAIL
+
+# ==================== 静态API响应缓存 ====================
+# 方案/病虫害/核心统计等接口的数据固定不变，启动时序列化一次并附带ETag；
+# 前端轮询带If-None-Match命中时直接返回304，序列化和传输成本都归零
+
+def _make_static_json(data):
+    """预序列化静态JSON数据，返回(响应体bytes, ETag)"""
+    body = app.json.dumps(data).encode('utf-8')
+    etag = hashlib.md5(body).hexdigest()
+    return body, etag
+
+
+def _static_json_response(body, etag):
+    """返回带ETag的JSON响应；If-None-Match命中时返回304"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    # set_etag按RFC 7232输出带引号的entity-tag，中间代理才能正确校验
+    response.set_etag(etag)
+    return response
+
+
+_CORE_STATS_BODY, _CORE_STATS_ETAG = _make_static_json({
+    "statistics": 15,
+    "effect": 2.7,
+    "efficiency": 3.15,
+    "energy_consumption": 2.3,
+    "speed": 2.00,
+    "recognition_rate": 5.13,
+    "computing_power": 3.20
+})
+
+_PESTS_BODY, _PESTS_ETAG = _make_static_json([
+    {"icon": "🐛", "name": "蚜虫", "percentage": 23},
+    {"icon": "🦗", "name": "蝗虫", "percentage": 15},
+    {"icon": "🍄", "name": "真菌", "percentage": 12}
+])
+
+_SOLUTION_BODY, _SOLUTION_ETAG = _make_static_json({
+    "leaf_position": "A区-3号",
+    "pest_type": "蚜虫",
+    "harm_level": "中度",
+    "recommended_agent": "吡虫啉",
+    "pesticide_residue": "≤0.5mg/kg",
+    "control_cycle": "7-10天"
+})
+
+_BOTTOM_SOLUTIONS_BODY, _BOTTOM_SOLUTIONS_ETAG = _make_static_json([
+    {"icon": "💧", "title": "水分消耗", "value": "56L"},
+    {"icon": "⚡", "title": "电力消耗", "value": "200kWh"},
+    {"icon": "🌱", "title": "作物健康度", "value": "92%"},
+    {"icon": "🎯", "title": "巡检进度", "value": "68%"}
+])
 
 # ==================== API路由 ====================
 
+# 首页gzip预压缩：启动时生成/刷新 static/index.html.gz，
+# 支持gzip的客户端直接收预压缩文件，线上传输体积约降5倍
+_INDEX_PATH = os.path.join('static', 'index.html')
+_INDEX_GZ_PATH = _INDEX_PATH + '.gz'
+
+
+def _build_index_gzip():
+    """生成static/index.html.gz（仅当源文件比压缩文件新时重建）"""
+    try:
+        src_mtime = os.path.getmtime(_INDEX_PATH)
+        if (not os.path.exists(_INDEX_GZ_PATH)
+                or os.path.getmtime(_INDEX_GZ_PATH) < src_mtime):
+            with open(_INDEX_PATH, 'rb') as f:
+                data = f.read()
+            with open(_INDEX_GZ_PATH, 'wb') as f:
+                f.write(gzip.compress(data, 9))
+    except OSError as e:
+        print(f"警告: 预压缩index.html失败: {e}")
+
+
+_build_index_gzip()
+
+
 @app.route('/')
 def index():
     """主页"""
+    if ('gzip' in request.headers.get('Accept-Encoding', '')
+            and os.path.exists(_INDEX_GZ_PATH)):
+        response = send_from_directory('static', 'index.html.gz',
+                                       mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
     return send_from_directory('static', 'index.html')
 
 @app.route('/video_feed')
@@ -282,8 +594,8 @@ def get_device_status():
 def get_robot_status():
     """获取机器人状态"""
     return jsonify({
-        "x": robot_position["x"],
-        "y": robot_position["y"],
+        "x": robot_position[0],
+        "y": robot_position[1],
         "battery": 100,
         "status": "online"
     })
@@ -301,14 +613,16 @@ def control_robot():
             x = data.get('x', 50)
             y = data.get('y', 50)
             
-            # 更新机器人位置
-            robot_position['x'] = max(0, min(100, x))
-            robot_position['y'] = max(0, min(100, y))
-            
+            # 更新机器人位置（写侧加锁保证两个分量一致；
+            # 共享数组是int类型，小数坐标四舍五入后存入）
+            with robot_position.get_lock():
+                robot_position[0] = max(0, min(100, int(round(x))))
+                robot_position[1] = max(0, min(100, int(round(y))))
+
             return jsonify({
                 "success": True,
                 "message": f"机器人移动到 ({x}, {y})",
-                "position": robot_position
+                "position": {"x": robot_position[0], "y": robot_position[1]}
             })
         else:
             return jsonify({
@@ -350,85 +664,57 @@ def device_cmd():
 @app.route('/api/stats/core')
 def get_core_stats():
     """获取核心功能统计"""
-    return jsonify({
-        "statistics": 15,
-        "effect": 2.7,
-        "efficiency": 3.15,
-        "energy_consumption": 2.3,
-        "speed": 2.00,
-        "recognition_rate": 5.13,
-        "computing_power": 3.20
-    })
+    return _static_json_response(_CORE_STATS_BODY, _CORE_STATS_ETAG)
 
 @app.route('/api/pests')
 def get_pests():
     """获取病虫害数据"""
-    return jsonify([
-        {"icon": "🐛", "name": "蚜虫", "percentage": 23},
-        {"icon": "🦗", "name": "蝗虫", "percentage": 15},
-        {"icon": "🍄", "name": "真菌", "percentage": 12}
-    ])
+    return _static_json_response(_PESTS_BODY, _PESTS_ETAG)
 
 @app.route('/api/solution')
 def get_solution():
     """获取防治方案"""
-    return jsonify({
-        "leaf_position": "A区-3号",
-        "pest_type": "蚜虫",
-        "harm_level": "中度",
-        "recommended_agent": "吡虫啉",
-        "pesticide_residue": "≤0.5mg/kg",
-        "control_cycle": "7-10天"
-    })
+    return _static_json_response(_SOLUTION_BODY, _SOLUTION_ETAG)
 
 @app.route('/api/solution/bottom')
 def get_bottom_solutions():
     """获取底部解决方案数据 - 方案D：混合监控型"""
-    return jsonify([
-        {"icon": "💧", "title": "水分消耗", "value": "56L"},
-        {"icon": "⚡", "title": "电力消耗", "value": "200kWh"},
-        {"icon": "🌱", "title": "作物健康度", "value": "92%"},
-        {"icon": "🎯", "title": "巡检进度", "value": "68%"}
-    ])
+    return _static_json_response(_BOTTOM_SOLUTIONS_BODY, _BOTTOM_SOLUTIONS_ETAG)
 
 # ==================== 系统信息获取函数 ====================
 
 def get_cpu_usage():
     """获取CPU使用率"""
+    if _HAS_PSUTIL:
+        # interval=None 非阻塞，返回自上次调用以来的使用率
+        # （模块导入时已做过基准采样，不会像interval=1那样阻塞请求1秒）
+        return round(psutil.cpu_percent(interval=None))
+    # 备用方案：读取/proc/stat
     try:
-        # 使用psutil库（需要安装: pip3 install psutil）
-        import psutil
-        return round(psutil.cpu_percent(interval=1))
-    except ImportError:
-        # 备用方案：读取/proc/stat
-        try:
-            with open('/proc/stat', 'r') as f:
-                line = f.readline()
-                cpu_times = [float(x) for x in line.split()[1:]]
-                idle_time = cpu_times[3]
-                total_time = sum(cpu_times)
-                usage = 100 * (1 - idle_time / total_time)
-                return round(usage)
-        except:
-            return 45  # 默认值
+        with open('/proc/stat', 'r') as f:
+            line = f.readline()
+            cpu_times = [float(x) for x in line.split()[1:]]
+            idle_time = cpu_times[3]
+            total_time = sum(cpu_times)
+            usage = 100 * (1 - idle_time / total_time)
+            return round(usage)
+    except:
+        return 45  # 默认值
 
 def get_memory_usage():
     """获取内存使用率"""
-    try:
-        # 使用psutil库
-        import psutil
+    if _HAS_PSUTIL:
         return round(psutil.virtual_memory().percent)
-    except ImportError:
-        # 备用方案：读取/proc/meminfo
-        try:
-            with open('/proc/meminfo', 'r') as f:
-                lines = f.readlines()
-                mem_total = int(lines[0].split()[1])
-                mem_available = int(lines[2].split()[1])
-                usage = 100 * (1 - mem_available / mem_total)
-                return round(usage)
-        except:
-            return 62  # 默认值
+    # 备用方案：读取/proc/meminfo
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            lines = f.readlines()
+            mem_total = int(lines[0].split()[1])
+            mem_available = int(lines[2].split()[1])
+            usage = 100 * (1 - mem_available / mem_total)
+            return round(usage)
+    except:
+        return 62  # 默认值
 
 def get_cpu_temperature():
     """获取CPU温度（树莓派专用）"""
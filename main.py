@@ -220,7 +220,8 @@ if __name__ == '__main__':
         app_thread = Thread(target=app.run, kwargs={
             'host': '0.0.0.0',
             'port': 5000,
-            'debug': False
+            'debug': False,
+            'threaded': True  # 不开多线程的话所有请求会被串行处理
         }, daemon=True)
         app_thread.start()
         
@@ -78,5 +78,11 @@ echo "按 Ctrl+C 停止服务器"
 echo "=========================================="
 echo ""
 
-# 运行Python后端
-python3 app.py
\ No newline at end of file
+# 运行Python后端（优先使用gunicorn，gthread线程池适配MJPEG长连接；
+# 摄像头只能被一个进程持有，因此固定单worker多线程）
+if command -v gunicorn &> /dev/null; then
+    gunicorn -k gthread -w 1 --threads 8 -b 0.0.0.0:5000 app:app
+else
+    echo -e "${YELLOW}⚠${NC} 未安装gunicorn，回退到Flask内置服务器"
+    python3 app.py
+fi
\ No newline at end of file
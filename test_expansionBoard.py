@@ -6,6 +6,8 @@
 # to visualize duty cycle changes and its impact on brightness.
 
 import board
+import struct
+from array import array
 from time import sleep
 
 from adafruit_pca9685 import PCA9685
@@ -20,34 +22,46 @@ i2c = board.I2C()  # uses board.SCL and board.SDA
 pca = PCA9685(i2c, address=0x41)
 
 # Set the PWM frequency to 60hz.
+# (the frequency setter also enables MODE1 auto-increment, which the
+# burst register writes below rely on)
 pca.frequency = 60
 
 # Set the PWM duty cycle for channel zero to 50%. duty_cycle is 16 bits to match other PWM objects
 # but the PCA9685 will only actually give 12 bits of resolution.
 
+# PCA9685 register map: LED0_ON_L = 0x06, four registers per channel.
+_LED0_ON_L = 0x06
+
+
+def set_servo_duty(channel, duty_cycle):
+	"""Write a channel's ON/OFF registers in one auto-increment burst.
+
+	pca.channels[n].duty_cycle splits each assignment into separate I2C
+	transactions; writing all 4 bytes (ON=0, OFF=duty>>4) from LEDn_ON_L
+	in a single burst halves the bus transactions and skips the Python
+	attribute dispatch on every sweep step.
+	"""
+	reg = _LED0_ON_L + 4 * channel
+	with pca.i2c_device as dev:
+		dev.write(bytes([reg]) + struct.pack('<HH', 0, duty_cycle >> 4))
+
+
 print(f"Open fan")
 pca.channels[10].duty_cycle = 0x2000
 pca.channels[11].duty_cycle = 0x0000
 
 print(f"Test Servo")
-pca.channels[1].duty_cycle = 0x1300
+set_servo_duty(1, 0x1300)
 sleep(1)
-for i in range(0x1300,0x2000,0x5F):
-	sleep(0.03)
-	if debug:
-		print(f"0x{i:02x}")
-	pca.channels[1].duty_cycle = i
 
+# Precompute the whole sweep so the hot loop is just the 30ms servo
+# cadence plus one burst register write per step.
+sweep = array('H', list(range(0x1300, 0x2000, 0x5F))
+              + list(range(0x2000, 0x1000, -0x5F))
+              + list(range(0x1000, 0x1300, 0x5F)))
 
-for i in range(0x2000,0x1000,-0x5F):
-	sleep(0.03)
-	if debug:
-		print(f"0x{i:02x}")
-	pca.channels[1].duty_cycle = i
-	
-for i in range(0x1000,0x1300,0x5F):
+for duty in sweep:
 	sleep(0.03)
 	if debug:
-		print(f"0x{i:02x}")
-	pca.channels[1].duty_cycle = i
-	
+		print(f"0x{duty:04x}")
+	set_servo_duty(1, duty)